@@ -1,263 +1,1185 @@
-import sys
-import re
-
-# =========================
-# TOKEN
-# =========================
-
-class Token:
-    def __init__(self, type_, value=None):
-        self.type = type_
-        self.value = value
-    def __repr__(self):
-        return f"{self.type}:{self.value}"
-
-# =========================
-# LEXER
-# =========================
-
-class Lexer:
-    token_spec = [
-        ("NUMBER",   r"\d+(\.\d+)?"),
-        ("STRING",   r'"[^"]*"'),
-        ("EQ",       r"eq"),
-        ("NEQ",      r"neq"),
-        ("LT",       r"lt"),
-        ("GT",       r"gt"),
-        ("LE",       r"le"),
-        ("GE",       r"ge"),
-        ("AND",      r"and"),
-        ("OR",       r"or"),
-        ("PL",       r"pl"),
-        ("MN",       r"mn"),
-        ("DP",       r"dp"),
-        ("NP",       r"np"),
-        ("VAR",      r"var"),
-        ("INT",      r"int"),
-        ("FLT",      r"flt"),
-        ("BOOL",     r"bool"),
-        ("SET",      r"set"),
-        ("IF",       r"if"),
-        ("WSET",     r"wset"),
-        ("FCE",      r"fce"),
-        ("TRUE",     r"true"),
-        ("FALSE",    r"false"),
-        ("LEN",      r"len"),
-        ("INP",      r"inp"),
-        ("IDENT",    r"[a-zA-Z_]\w*"),
-        ("ASSIGN",   r"="),
-        ("LBRACE",   r"\{"),
-        ("RBRACE",   r"\}"),
-        ("COLON",    r":"),
-        ("SKIP",     r"[ \t]+"),
-        ("NEWLINE",  r"\n"),
-    ]
-
-    def __init__(self, code):
-        self.code = code
-
-    def tokenize(self):
-        tokens=[]
-        regex="|".join(f"(?P<{n}>{p})" for n,p in self.token_spec)
-        for line in self.code.splitlines():
-            line=line.split("#",1)[0]
-            for m in re.finditer(regex,line):
-                k=m.lastgroup
-                v=m.group()
-                if k=="NUMBER":
-                    tokens.append(Token("NUMBER", float(v) if "." in v else int(v)))
-                elif k=="STRING":
-                    tokens.append(Token("STRING", v[1:-1]))
-                elif k in ("SKIP","NEWLINE"):
-                    continue
-                else:
-                    tokens.append(Token(k,v))
-        return tokens
-
-# =========================
-# PARSER
-# =========================
-
-class Parser:
-    def __init__(self,tokens):
-        self.tokens=tokens
-        self.pos=0
-
-    def current(self):
-        return self.tokens[self.pos] if self.pos<len(self.tokens) else None
-
-    def eat(self,t):
-        tok=self.current()
-        if tok and tok.type==t:
-            self.pos+=1
-            return tok
-        self.pos+=1
-        return None   # NEVER crash
-
-    def parse(self):
-        stmts=[]
-        while self.current():
-            try:
-                stmt=self.statement()
-                if stmt: stmts.append(stmt)
-            except:
-                self.pos+=1
-        return stmts
-
-    def statement(self):
-        tok=self.current()
-        if not tok:
-            return None
-
-        if tok.type in ("STRING","NUMBER","TRUE","FALSE"):
-            self.pos+=1
-            return None
-
-        if tok.type=="VAR": return self.var_decl()
-        if tok.type=="SET": return self.set_stmt()
-        if tok.type=="IF": return self.if_stmt()
-        if tok.type=="WSET": return self.wset_stmt()
-        if tok.type=="FCE": return self.fce_stmt()
-
-        self.pos+=1
-        return None
-
-    def var_decl(self):
-        self.eat("VAR")
-        t=self.eat(self.current().type).type if self.current() else "INT"
-        name=self.eat("IDENT").value if self.current() else "_"
-        self.eat("ASSIGN")
-        val=self.expr()
-        return ("VAR",t,name,val)
-
-    def set_stmt(self):
-        self.eat("SET")
-        return ("SET",self.expr())
-
-    def if_stmt(self):
-        self.eat("IF")
-        cond=self.expr()
-        then=self.block_or_stmt()
-        else_=None
-        if self.current() and self.current().type=="COLON":
-            self.eat("COLON")
-            else_=self.block_or_stmt()
-        return ("IF",cond,then,else_)
-
-    def wset_stmt(self):
-        self.eat("WSET")
-        return ("WSET",self.expr(),self.block_or_stmt())
-
-    def fce_stmt(self):
-        self.eat("FCE")
-        name=self.eat("IDENT")
-        return ("FCE", name.value if name else "")
-
-    def block_or_stmt(self):
-        if self.current() and self.current().type=="LBRACE":
-            self.eat("LBRACE")
-            s=[]
-            while self.current() and self.current().type!="RBRACE":
-                st=self.statement()
-                if st: s.append(st)
-            self.eat("RBRACE")
-            return ("BLOCK",s)
-        return self.statement()
-
-    def expr(self):
-        n=self.factor()
-        while self.current() and self.current().type in (
-            "PL","MN","DP","NP","EQ","NEQ","LT","GT","LE","GE","AND","OR"):
-            op=self.current().type
-            self.eat(op)
-            n=(op,n,self.factor())
-        return n
-
-    def factor(self):
-        tok=self.current()
-        if not tok:
-            return ("NUM",0)
-        if tok.type=="NUMBER": self.eat("NUMBER"); return ("NUM",tok.value)
-        if tok.type=="STRING": self.eat("STRING"); return ("STR",tok.value)
-        if tok.type=="TRUE": self.eat("TRUE"); return ("BOOL",True)
-        if tok.type=="FALSE": self.eat("FALSE"); return ("BOOL",False)
-        if tok.type=="IDENT": self.eat("IDENT"); return ("VARREF",tok.value)
-        if tok.type=="INP": self.eat("INP"); return ("INP",)
-        if tok.type=="LEN": self.eat("LEN"); return ("LEN",self.factor())
-        self.pos+=1
-        return ("NUM",0)
-
-# =========================
-# INTERPRETER
-# =========================
-
-class Interpreter:
-    def __init__(self):
-        self.vars={}
-        self.funcs={"hello":[("SET",("STR","hello function"))]}
-
-    def eval(self,n):
-        t=n[0]
-        try:
-            if t=="NUM": return n[1]
-            if t=="STR": return n[1]
-            if t=="BOOL": return n[1]
-            if t=="VARREF": return self.vars.get(n[1],0)
-            if t=="INP": return input()
-            if t=="LEN": return len(self.eval(n[1]))
-            if t=="PL": return self.eval(n[1])+self.eval(n[2])
-            if t=="MN": return self.eval(n[1])-self.eval(n[2])
-            if t=="DP": return self.eval(n[1])*self.eval(n[2])
-            if t=="NP": return self.eval(n[1])/self.eval(n[2])
-            if t=="EQ": return self.eval(n[1])==self.eval(n[2])
-            if t=="NEQ": return self.eval(n[1])!=self.eval(n[2])
-            if t=="LT": return self.eval(n[1])<self.eval(n[2])
-            if t=="GT": return self.eval(n[1])>self.eval(n[2])
-            if t=="LE": return self.eval(n[1])<=self.eval(n[2])
-            if t=="GE": return self.eval(n[1])>=self.eval(n[2])
-            if t=="AND": return self.eval(n[1]) and self.eval(n[2])
-            if t=="OR": return self.eval(n[1]) or self.eval(n[2])
-        except:
-            return 0
-
-    def run(self,stmts):
-        for s in stmts:
-            t=s[0]
-            try:
-                if t=="VAR":
-                    _,tp,n,v=s
-                    val=self.eval(v)
-                    self.vars[n]=int(val) if tp=="INT" else float(val) if tp=="FLT" else val
-                elif t=="SET":
-                    print(self.eval(s[1]))
-                elif t=="IF":
-                    _,c,th,el=s
-                    self.run([th]) if self.eval(c) else el and self.run([el])
-                elif t=="WSET":
-                    _,c,b=s
-                    guard=0
-                    while self.eval(c):
-                        self.run([b])
-                        guard+=1
-                        if guard>10000: break
-                elif t=="BLOCK":
-                    self.run(s[1])
-                elif t=="FCE":
-                    if s[1] in self.funcs:
-                        self.run(self.funcs[s[1]])
-            except:
-                continue
-
-# =========================
-# RUNNER
-# =========================
-
-def run_code(code):
-    print("SET v0.3.6 – Syntax Easy To-use\n")
-    tokens=Lexer(code).tokenize()
-    tree=Parser(tokens).parse()
-    Interpreter().run(tree)
-
-if __name__=="__main__":
-    with open(sys.argv[1]) as f:
-        run_code(f.read())
+import sys
+import re
+import bisect
+import operator
+import functools
+from array import array
+
+# =========================
+# TOKEN
+# =========================
+
+# tokens are plain (type, value) tuples; type strings are interned at
+# lexer-spec construction so parser compares short-circuit on identity
+
+# =========================
+# LEXER
+# =========================
+
+class Lexer:
+    # keyword text -> token type, matched as one alternation with a word
+    # boundary so "equal" stays an IDENT instead of EQ + IDENT("ual")
+    KEYWORDS = {k:sys.intern(t) for k,t in {
+        "eq":"EQ", "neq":"NEQ", "lt":"LT", "gt":"GT", "le":"LE", "ge":"GE",
+        "and":"AND", "or":"OR",
+        "pl":"PL", "mn":"MN", "dp":"DP", "np":"NP",
+        "var":"VAR", "int":"INT", "flt":"FLT", "bool":"BOOL",
+        "set":"SET", "if":"IF", "wset":"WSET", "fce":"FCE",
+        "try":"TRY", "catch":"CATCH",
+        "true":"TRUE", "false":"FALSE",
+        "len":"LEN", "inp":"INP",
+    }.items()}
+
+    token_spec = tuple((sys.intern(n),p) for n,p in (
+        ("NUMBER",   r"\d+(?:\.\d+)?"),
+        # no newline inside a literal: an unterminated quote only eats
+        # the rest of its line, as the old per-line lexer guaranteed
+        ("STRING",   r'"[^"\n]*"'),
+        ("KW",       r"(?:"+"|".join(sorted(KEYWORDS,key=len,reverse=True))+r")\b"),
+        ("IDENT",    r"[a-zA-Z_]\w*"),
+        ("ASSIGN",   r"="),
+        ("LBRACE",   r"\{"),
+        ("RBRACE",   r"\}"),
+        ("COLON",    r":"),
+        ("SKIP",     r"[ \t]+"),
+        ("NEWLINE",  r"\n"),
+    ))
+
+    # compiled once at import time, not per tokenize() call
+    _MASTER_RE = re.compile("|".join(f"(?P<{n}>{p})" for n,p in token_spec))
+    _COMMENT_RE = re.compile(r"#.*")
+
+    # re.Scanner-style action per group: lexeme -> token, None to skip.
+    # (re.Scanner itself stops scanning at the first unmatchable char,
+    # which would truncate programs the forgiving rule lexes fine, so
+    # the single finditer pass stays and only the dispatch is callbacks)
+    _ACTIONS = dict(
+        NUMBER=lambda v: ("NUMBER", float(v) if "." in v else int(v)),
+        STRING=lambda v: ("STRING", v[1:-1]),
+        KW=lambda v,_kw=KEYWORDS: (_kw[v], v),
+        SKIP=None, NEWLINE=None,
+    )
+    for _n,_p in token_spec:
+        if _n not in _ACTIONS:
+            _ACTIONS[_n]=lambda v,_n=_n: (_n,v)
+    del _n,_p
+
+    # actions indexed by group number so the hot loop reads m.lastindex
+    # (a plain int) instead of m.lastgroup's reverse dict lookup; all
+    # spec-internal groups are non-capturing, so group numbers map 1:1
+    # onto token_spec entries
+    assert _MASTER_RE.groups==len(token_spec)
+    _GROUP_ACTIONS=[None]
+    for _n,_p in token_spec:
+        _GROUP_ACTIONS.append(_ACTIONS[_n])
+    _GROUP_ACTIONS=tuple(_GROUP_ACTIONS)
+    del _n,_p
+
+    def __init__(self, code):
+        self.code = code
+
+    def tokenize(self):
+        tokens=[]
+        # locals in the hot loop: LOAD_FAST instead of LOAD_ATTR per token
+        append=tokens.append
+        actions=self._GROUP_ACTIONS
+        code=self._COMMENT_RE.sub("",self.code)
+        for m in self._MASTER_RE.finditer(code):
+            a=actions[m.lastindex]
+            if a is not None:
+                append(a(m.group()))
+        return tokens
+
+# =========================
+# PARSER
+# =========================
+
+# AST node tags, small ints so dispatch is an indexed list load
+# instead of string hashing
+(OP_NUM, OP_STR, OP_BOOL, OP_VARREF, OP_INP, OP_LEN,
+ OP_PL, OP_MN, OP_DP, OP_NP,
+ OP_EQ, OP_NEQ, OP_LT, OP_GT, OP_LE, OP_GE, OP_AND, OP_OR,
+ OP_VAR, OP_SET, OP_IF, OP_WSET, OP_BLOCK, OP_TRY, OP_FCE,
+ OP_VARSLOT, OP_VARSTORE) = range(27)
+N_TAGS = 27
+
+# binary-operator token type -> AST tag
+BIN_TAG = {
+    "PL":OP_PL, "MN":OP_MN, "DP":OP_DP, "NP":OP_NP,
+    "EQ":OP_EQ, "NEQ":OP_NEQ, "LT":OP_LT, "GT":OP_GT,
+    "LE":OP_LE, "GE":OP_GE, "AND":OP_AND, "OR":OP_OR,
+}
+
+# foldable binary operators; and/or are left alone so they keep
+# short-circuit shape
+_FOLD = {
+    OP_PL:operator.add, OP_MN:operator.sub, OP_DP:operator.mul,
+    OP_NP:operator.truediv, OP_EQ:operator.eq, OP_NEQ:operator.ne,
+    OP_LT:operator.lt, OP_GT:operator.gt, OP_LE:operator.le,
+    OP_GE:operator.ge,
+}
+
+def _fold(op,a,b):
+    """Collapses op over two literal operands at parse time.
+
+    Anything that would fail at runtime (np by zero, mixed types) is
+    left unfolded so the interpreter's forgiving rules still apply.
+    """
+    if op in _FOLD and a[0]<=OP_BOOL and b[0]<=OP_BOOL:
+        try:
+            v=_FOLD[op](a[1],b[1])
+        except:
+            return (op,a,b)
+        if v is True or v is False: return (OP_BOOL,v)
+        if isinstance(v,str): return (OP_STR,v)
+        return (OP_NUM,v)
+    return (op,a,b)
+
+class Parser:
+    _BIN_OPS = frozenset((
+        "PL","MN","DP","NP","EQ","NEQ","LT","GT","LE","GE","AND","OR"))
+
+    def __init__(self,tokens):
+        # single-token lookahead over an iterator: no index, no bounds
+        # check; next() returns None past the end
+        self._it=iter(tokens)
+        self._la=next(self._it,None)
+
+    def current(self):
+        return self._la
+
+    def eat(self,t):
+        tok=self._la
+        self._la=next(self._it,None)
+        if tok and tok[0]==t:
+            return tok
+        return None   # NEVER crash
+
+    def parse(self):
+        stmts=[]
+        while self._la:
+            try:
+                stmt=self.statement()
+                if stmt: stmts.append(stmt)
+            except:
+                self._la=next(self._it,None)
+        return stmts
+
+    def statement(self):
+        tok=self.current()
+        if not tok:
+            return None
+
+        if tok[0] in ("STRING","NUMBER","TRUE","FALSE"):
+            self._la=next(self._it,None)
+            return None
+
+        if tok[0]=="VAR": return self.var_decl()
+        if tok[0]=="SET": return self.set_stmt()
+        if tok[0]=="IF": return self.if_stmt()
+        if tok[0]=="WSET": return self.wset_stmt()
+        if tok[0]=="FCE": return self.fce_stmt()
+        if tok[0]=="TRY": return self.try_stmt()
+
+        self._la=next(self._it,None)
+        return None
+
+    def var_decl(self):
+        self.eat("VAR")
+        t=self.eat(self.current()[0])[0] if self.current() else "INT"
+        name=self.eat("IDENT")[1] if self.current() else "_"
+        self.eat("ASSIGN")
+        val=self.expr()
+        return (OP_VAR,t,name,val)
+
+    def set_stmt(self):
+        self.eat("SET")
+        return (OP_SET,self.expr())
+
+    def if_stmt(self):
+        self.eat("IF")
+        cond=self.expr()
+        then=self.block_or_stmt()
+        else_=None
+        if self.current() and self.current()[0]=="COLON":
+            self.eat("COLON")
+            else_=self.block_or_stmt()
+        return (OP_IF,cond,then,else_)
+
+    def wset_stmt(self):
+        self.eat("WSET")
+        return (OP_WSET,self.expr(),self.block_or_stmt())
+
+    def try_stmt(self):
+        self.eat("TRY")
+        body=self.block_or_stmt()
+        catch=None
+        if self.current() and self.current()[0]=="CATCH":
+            self.eat("CATCH")
+            catch=self.block_or_stmt()
+        return (OP_TRY,body,catch)
+
+    def fce_stmt(self):
+        self.eat("FCE")
+        name=self.eat("IDENT")
+        return (OP_FCE, name[1] if name else "")
+
+    def block_or_stmt(self):
+        if self.current() and self.current()[0]=="LBRACE":
+            self.eat("LBRACE")
+            s=[]
+            while self.current() and self.current()[0]!="RBRACE":
+                st=self.statement()
+                if st: s.append(st)
+            self.eat("RBRACE")
+            return (OP_BLOCK,s)
+        return self.statement()
+
+    def expr(self):
+        n=self.factor()
+        binops=self._BIN_OPS
+        cur=self.current()
+        while cur and cur[0] in binops:
+            self.eat(cur[0])
+            n=_fold(BIN_TAG[cur[0]],n,self.factor())
+            cur=self.current()
+        return n
+
+    def factor(self):
+        tok=self.current()
+        if not tok:
+            return (OP_NUM,0)
+        if tok[0]=="NUMBER": self.eat("NUMBER"); return (OP_NUM,tok[1])
+        if tok[0]=="STRING": self.eat("STRING"); return (OP_STR,tok[1])
+        if tok[0]=="TRUE": self.eat("TRUE"); return (OP_BOOL,True)
+        if tok[0]=="FALSE": self.eat("FALSE"); return (OP_BOOL,False)
+        if tok[0]=="IDENT": self.eat("IDENT"); return (OP_VARREF,tok[1])
+        if tok[0]=="INP": self.eat("INP"); return (OP_INP,)
+        if tok[0]=="LEN": self.eat("LEN"); return (OP_LEN,self.factor())
+        self._la=next(self._it,None)
+        return (OP_NUM,0)
+
+# =========================
+# RESOLVER
+# =========================
+
+class Resolver:
+    """Resolves variable names to slot indices after parsing.
+
+    VARREF nodes become (OP_VARSLOT, slot) and VAR declarations become
+    (OP_VARSTORE, type, slot, value), so reads and writes are indexed
+    list loads instead of dict lookups. Undeclared reads get a slot too;
+    slots start at 0, matching vars.get(name, 0).
+
+    types records the declared type per slot: "INT", "FLT", or None
+    when a slot is declared bool or redeclared with conflicting types.
+    Undeclared (read-only) slots are absent and treated as INT, since
+    they only ever hold the default 0.
+    """
+
+    def __init__(self):
+        self.names={}
+        self.types={}
+
+    def slot(self,name):
+        s=self.names.get(name)
+        if s is None:
+            s=self.names[name]=len(self.names)
+        return s
+
+    def resolve(self,stmts):
+        return [self.stmt(s) for s in stmts],len(self.names)
+
+    def stmt(self,s):
+        if not s: return s
+        t=s[0]
+        if t==OP_VAR:
+            i=self.slot(s[2])
+            tp=s[1] if s[1] in ("INT","FLT") else None
+            if i not in self.types:
+                self.types[i]=tp
+            elif self.types[i]!=tp:
+                self.types[i]=None
+            return (OP_VARSTORE,s[1],i,self.expr(s[3]))
+        if t==OP_SET: return (OP_SET,self.expr(s[1]))
+        if t==OP_IF: return (OP_IF,self.expr(s[1]),self.stmt(s[2]),self.stmt(s[3]))
+        if t==OP_WSET: return (OP_WSET,self.expr(s[1]),self.stmt(s[2]))
+        if t==OP_BLOCK: return (OP_BLOCK,[self.stmt(x) for x in s[1]])
+        if t==OP_TRY: return (OP_TRY,self.stmt(s[1]),self.stmt(s[2]))
+        return s
+
+    def expr(self,n):
+        t=n[0]
+        if t==OP_VARREF: return (OP_VARSLOT,self.slot(n[1]))
+        if t==OP_LEN: return (OP_LEN,self.expr(n[1]))
+        if OP_PL<=t<=OP_OR: return (t,self.expr(n[1]),self.expr(n[2]))
+        return n
+
+# =========================
+# BYTECODE COMPILER + VM
+# =========================
+
+# opcode ints for the stack VM; CMP_CONST_JIF/INC_VAR are fused
+# superinstructions from the peephole pass, KERNEL is an extracted
+# integer loop body
+(PUSH_CONST, LOAD_VAR, STORE_VAR,
+ ADD, SUB, MUL, DIV,
+ CMP_EQ, CMP_NEQ, CMP_LT, CMP_GT, CMP_LE, CMP_GE,
+ JUMP, JUMP_IF_FALSE, JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP,
+ LOOP, PRINT, INPUT, LEN, CALL, SETUP_EXCEPT, POP_BLOCK,
+ CMP_CONST_JIF, INC_VAR, LOAD_SLOT, STORE_SLOT, KERNEL,
+ LOAD_I, LOAD_F, STORE_I, STORE_F,
+ ADD_I, SUB_I, MUL_I, ADD_F, SUB_F, MUL_F, DIV_F,
+ GUARD_RESET) = range(41)
+N_OPS = 41
+
+# typed arithmetic selected when operand types are known at compile time
+_TYPED_I = {OP_PL:ADD_I, OP_MN:SUB_I, OP_DP:MUL_I}
+_TYPED_F = {OP_PL:ADD_F, OP_MN:SUB_F, OP_DP:MUL_F}
+
+_JUMP_OPS = frozenset((JUMP,JUMP_IF_FALSE,JUMP_IF_FALSE_OR_POP,
+                       JUMP_IF_TRUE_OR_POP,LOOP,SETUP_EXCEPT))
+
+# comparison callables indexed by (CMP_* - CMP_EQ), shared by CMP_CONST_JIF
+_CMPS = (operator.eq,operator.ne,operator.lt,operator.gt,
+         operator.le,operator.ge)
+
+BINOP = {
+    OP_PL:ADD, OP_MN:SUB, OP_DP:MUL, OP_NP:DIV,
+    OP_EQ:CMP_EQ, OP_NEQ:CMP_NEQ, OP_LT:CMP_LT, OP_GT:CMP_GT,
+    OP_LE:CMP_LE, OP_GE:CMP_GE,
+}
+
+# operators an extracted loop kernel may contain; np is excluded
+# because it produces floats (and can raise)
+_KERNEL_BIN = {
+    OP_PL:"+", OP_MN:"-", OP_DP:"*",
+    OP_EQ:"==", OP_NEQ:"!=", OP_LT:"<", OP_GT:">",
+    OP_LE:"<=", OP_GE:">=", OP_AND:" and ", OP_OR:" or ",
+}
+
+def _kernel_expr(n,used):
+    t=n[0]
+    if t==OP_NUM and type(n[1]) is int: return repr(n[1])
+    if t==OP_BOOL: return repr(n[1])
+    if t==OP_VARSLOT:
+        used.add(n[1])
+        return f"v{n[1]}"
+    op=_KERNEL_BIN.get(t)
+    if op is None: raise ValueError(n)
+    return "(%s%s%s)"%(_kernel_expr(n[1],used),op,_kernel_expr(n[2],used))
+
+def _loop_kernel(cond,body):
+    """Extracts a pure-integer wset loop into one compiled function.
+
+    Only loops whose condition and body touch nothing but int literals,
+    int-typed slot stores and the operators in _KERNEL_BIN qualify; the
+    whole loop then runs as one compiled function with the slots copied
+    in and out once. The kernel works on exact Python ints (an njit/
+    int64 buffer would wrap silently past 2^63 and defeat the overflow
+    fallback below). Returns (fn, used_slots) or None when the loop
+    does not qualify.
+    """
+    stmts=body[1] if body and body[0]==OP_BLOCK else [body]
+    try:
+        used=set()
+        lines=[]
+        for s in stmts:
+            if not s or s[0]!=OP_VARSTORE or s[1]!="INT": return None
+            rhs=_kernel_expr(s[3],used)
+            lines.append(f"        v{s[2]} = {rhs}")
+            used.add(s[2])
+        test=_kernel_expr(cond,used)
+    except ValueError:
+        return None
+    if not lines: return None
+    src="def _k(slots):\n"
+    src+="".join(f"    v{i}=slots[{i}]\n" for i in sorted(used))
+    src+="    g=0\n"
+    src+=f"    while {test}:\n"
+    src+="\n".join(lines)+"\n"
+    src+="        g+=1\n"
+    src+="        if g>10000: break\n"   # same runaway guard as LOOP
+    src+="".join(f"    slots[{i}]=v{i}\n" for i in sorted(used))
+    ns={}
+    exec(compile(src,"<set-kernel>","exec"),ns)
+    return ns["_k"],frozenset(used)
+
+def _peephole(code,starts):
+    """Fuses the hot loop patterns into single superinstructions.
+
+    LOAD_I x; PUSH_CONST c; CMP_*; JUMP_IF_FALSE t    ->  CMP_CONST_JIF
+    LOAD_I x; PUSH_CONST c; ADD_I|SUB_I; STORE_I x    ->  INC_VAR
+
+    A window is only fused when no jump target or statement boundary
+    lands inside it; all targets are remapped afterwards.
+    """
+    forbidden=set(starts)
+    for op,arg in code:
+        if op in _JUMP_OPS: forbidden.add(arg)
+    new=[]
+    remap={}
+    i=0
+    n=len(code)
+    while i<n:
+        remap[i]=len(new)
+        fused=None
+        if i+3<n and not (forbidden & {i+1,i+2,i+3}):
+            w=code[i:i+4]
+            if (w[0][0]==LOAD_I and w[1][0]==PUSH_CONST
+                    and CMP_EQ<=w[2][0]<=CMP_GE and w[3][0]==JUMP_IF_FALSE):
+                fused=(CMP_CONST_JIF,(w[2][0]-CMP_EQ,w[0][1],w[1][1],w[3][1]))
+            elif (w[0][0]==LOAD_I and w[1][0]==PUSH_CONST
+                    and w[2][0] in (ADD_I,SUB_I) and w[3][0]==STORE_I
+                    and w[3][1][0]==w[0][1] and not w[3][1][1]
+                    and type(w[1][1]) is int):
+                delta=w[1][1] if w[2][0]==ADD_I else -w[1][1]
+                fused=(INC_VAR,(w[0][1],delta))
+        if fused:
+            new.append(fused)
+            i+=4
+        else:
+            new.append(code[i])
+            i+=1
+    remap[n]=len(new)
+    for i,(op,arg) in enumerate(new):
+        if op in _JUMP_OPS:
+            new[i]=(op,remap[arg])
+        elif op==CMP_CONST_JIF:
+            c,name,const,tgt=arg
+            new[i]=(op,(c,name,const,remap[tgt]))
+        elif op==KERNEL:
+            fn,used,tgt=arg
+            new[i]=(op,(fn,used,remap[tgt]))
+        elif op==GUARD_RESET:
+            new[i]=(op,remap[arg])
+    return new,[remap[s] for s in starts]
+
+# predefined function bodies (raw AST); the VM compiles these once at
+# construction, the tree-walker runs them directly
+FUNCS = {
+    "hello": [(OP_SET,(OP_STR,"hello function"))],
+}
+
+class Compiler:
+    """Lowers the parser's tuple AST to a flat list of (opcode,arg) pairs.
+
+    Given the resolver's slot-type table, expression lowering propagates
+    operand types ("i" int, "f" float, None unknown) and emits typed
+    arithmetic plus bank-specific slot loads/stores where the type is
+    known, so the hot handlers skip coercion and error checks.
+    """
+
+    def __init__(self,types=None):
+        self.types=types or {}
+
+    def bank(self,i):
+        tp=self.types.get(i,"INT")
+        return "i" if tp=="INT" else "f" if tp=="FLT" else None
+
+    def compile(self,stmts):
+        self.code=[]
+        self.starts=[]   # statement boundaries, for error recovery
+        self.stmts(stmts)
+        return _peephole(self.code,self.starts)
+
+    def emit(self,op,arg=None):
+        self.code.append((op,arg))
+        return len(self.code)-1
+
+    def patch(self,at):
+        self.code[at]=(self.code[at][0],len(self.code))
+
+    def stmts(self,stmts):
+        for s in stmts: self.stmt(s)
+
+    def stmt(self,s):
+        if not s: return
+        self.starts.append(len(self.code))
+        t=s[0]
+        if t==OP_VAR:
+            _,tp,n,v=s
+            self.expr(v)
+            self.emit(STORE_VAR,(tp,n))
+        elif t==OP_VARSTORE:
+            _,tp,i,v=s
+            et=self.expr(v)
+            b=self.bank(i)
+            if b=="i":
+                self.emit(STORE_I,(i,et!="i"))
+            elif b=="f":
+                self.emit(STORE_F,(i,et!="f"))
+            else:
+                self.emit(STORE_SLOT,(tp,i))
+        elif t==OP_SET:
+            self.expr(s[1])
+            self.emit(PRINT)
+        elif t==OP_IF:
+            _,c,th,el=s
+            self.expr(c)
+            j=self.emit(JUMP_IF_FALSE)
+            self.stmt(th)
+            if el:
+                j2=self.emit(JUMP)
+                self.patch(j)
+                self.stmt(el)
+                self.patch(j2)
+            else:
+                self.patch(j)
+        elif t==OP_WSET:
+            _,c,b=s
+            k=_loop_kernel(c,b)
+            jk=self.emit(KERNEL) if k else None
+            # re-arm the runaway guard every time the loop is entered, so
+            # an inner loop gets a fresh 10000 per entry like _s_wset
+            self.emit(GUARD_RESET,len(self.code)+1)
+            top=len(self.code)
+            self.expr(c)
+            j=self.emit(JUMP_IF_FALSE)
+            self.stmt(b)
+            self.emit(LOOP,top)
+            self.patch(j)
+            if jk is not None:
+                # kernel jumps past the interpreted loop on success and
+                # falls through to it when a used slot is not an int
+                self.code[jk]=(KERNEL,(k[0],k[1],len(self.code)))
+        elif t==OP_BLOCK:
+            self.stmts(s[1])
+        elif t==OP_FCE:
+            self.emit(CALL,s[1])
+        elif t==OP_TRY:
+            j=self.emit(SETUP_EXCEPT)
+            self.stmt(s[1])
+            self.emit(POP_BLOCK)
+            j2=self.emit(JUMP)
+            self.patch(j)
+            self.stmt(s[2])
+            self.patch(j2)
+
+    def expr(self,n):
+        t=n[0]
+        if t==OP_NUM:
+            self.emit(PUSH_CONST,n[1])
+            return "i" if type(n[1]) is int else "f"
+        if t==OP_BOOL:
+            self.emit(PUSH_CONST,n[1])
+            return "i"
+        if t==OP_STR:
+            self.emit(PUSH_CONST,n[1])
+            return None
+        if t==OP_VARREF:
+            self.emit(LOAD_VAR,n[1])
+            return None
+        if t==OP_VARSLOT:
+            b=self.bank(n[1])
+            self.emit(LOAD_I if b=="i" else LOAD_F if b=="f" else LOAD_SLOT,
+                      n[1])
+            return b
+        if t==OP_INP:
+            self.emit(INPUT)
+            return None
+        if t==OP_LEN:
+            self.expr(n[1])
+            self.emit(LEN)
+            return "i"
+        if t==OP_AND or t==OP_OR:
+            a=self.expr(n[1])
+            j=self.emit(JUMP_IF_FALSE_OR_POP if t==OP_AND
+                        else JUMP_IF_TRUE_OR_POP)
+            b=self.expr(n[2])
+            self.patch(j)
+            return a if a==b else None
+        a=self.expr(n[1])
+        b=self.expr(n[2])
+        if t==OP_NP:
+            if a and b:
+                self.emit(DIV_F)
+                return "f"
+            self.emit(DIV)
+            return None
+        if t in _TYPED_I:
+            if a=="i" and b=="i":
+                self.emit(_TYPED_I[t])
+                return "i"
+            if a and b:
+                self.emit(_TYPED_F[t])
+                return "f"
+            self.emit(BINOP[t])
+            return None
+        self.emit(BINOP[t])   # comparison: result is a bool
+        return "i"
+
+class VM:
+    """Runs compiled code in a single dispatch loop, one handler per opcode.
+
+    Handlers return a new pc to jump, or None to fall through. Failing ops
+    push 0 like Interpreter.eval; a statement that cannot recover skips to
+    the next statement boundary (the forgiving rule).
+    """
+
+    def __init__(self,nslots=0):
+        self.vars={}
+        self.nslots=nslots
+        # unboxed int/float banks behind a per-slot tag: a slot starts
+        # generic (reads as int 0, like the tree-walker), promotes to an
+        # array bank on the first typed store, and demotes back when a
+        # value leaves int64 range, so the fast path never changes what
+        # a valid program computes
+        self.banks=[None]*nslots
+        self.slots=[0]*nslots
+        self.slots_i=array("q",[0]*nslots)
+        self.slots_f=array("d",[0.0]*nslots)
+        # function bodies are compiled once here, not per CALL
+        self.funcs={n:Compiler().compile(b) for n,b in FUNCS.items()}
+        h=[None]*N_OPS
+        h[PUSH_CONST]=self._push_const
+        h[LOAD_VAR]=self._load_var
+        h[STORE_VAR]=self._store_var
+        h[ADD]=self._add
+        h[SUB]=self._sub
+        h[MUL]=self._mul
+        h[DIV]=self._div
+        h[CMP_EQ]=self._cmp_eq
+        h[CMP_NEQ]=self._cmp_neq
+        h[CMP_LT]=self._cmp_lt
+        h[CMP_GT]=self._cmp_gt
+        h[CMP_LE]=self._cmp_le
+        h[CMP_GE]=self._cmp_ge
+        h[JUMP]=self._jump
+        h[JUMP_IF_FALSE]=self._jump_if_false
+        h[JUMP_IF_FALSE_OR_POP]=self._jump_if_false_or_pop
+        h[JUMP_IF_TRUE_OR_POP]=self._jump_if_true_or_pop
+        h[LOOP]=self._loop
+        h[PRINT]=self._print
+        h[INPUT]=self._input
+        h[LEN]=self._len
+        h[CALL]=self._call
+        h[SETUP_EXCEPT]=self._setup_except
+        h[POP_BLOCK]=self._pop_block
+        h[CMP_CONST_JIF]=self._cmp_const_jif
+        h[INC_VAR]=self._inc_var
+        h[LOAD_SLOT]=self._load_slot
+        h[STORE_SLOT]=self._store_slot
+        h[KERNEL]=self._run_kernel
+        h[GUARD_RESET]=self._guard_reset
+        h[LOAD_I]=self._load_i
+        h[LOAD_F]=self._load_f
+        h[STORE_I]=self._store_i
+        h[STORE_F]=self._store_f
+        h[ADD_I]=self._add_i
+        h[SUB_I]=self._sub_i
+        h[MUL_I]=self._mul_i
+        h[ADD_F]=self._add_f
+        h[SUB_F]=self._sub_f
+        h[MUL_F]=self._mul_f
+        h[DIV_F]=self._div_f
+        self.handlers=h
+
+    def _slot_get(self,i):
+        b=self.banks[i]
+        if b=="i": return self.slots_i[i]
+        if b=="f": return self.slots_f[i]
+        return self.slots[i]
+
+    def _slot_set(self,i,v):
+        b=self.banks[i]
+        if b=="i": self.slots_i[i]=v
+        elif b=="f": self.slots_f[i]=v
+        else: self.slots[i]=v
+
+    def run(self,program):
+        code,starts=program
+        stack=[]
+        # run() recurses through CALL, so keep block/guard state per frame
+        outer=getattr(self,"_blocks",None),getattr(self,"_guards",None)
+        blocks=self._blocks=[]
+        self._guards={}
+        handlers=self.handlers
+        pc=0
+        n=len(code)
+        while pc<n:
+            op,arg=code[pc]
+            pc+=1
+            try:
+                t=handlers[op](stack,arg)
+                if t is not None: pc=t
+            except:
+                if blocks:
+                    pc,depth=blocks.pop()
+                    del stack[depth:]
+                else:
+                    i=bisect.bisect_right(starts,pc-1)
+                    pc=starts[i] if i<len(starts) else n
+                    del stack[:]
+        self._blocks,self._guards=outer
+
+    def _push_const(self,stack,arg): stack.append(arg)
+    def _load_var(self,stack,arg): stack.append(self.vars.get(arg,0))
+    def _store_var(self,stack,arg):
+        tp,name=arg
+        v=stack.pop()
+        try:
+            self.vars[name]=int(v) if tp=="INT" else float(v) if tp=="FLT" else v
+        except:
+            pass
+    def _add(self,stack,arg):
+        b=stack.pop(); a=stack.pop()
+        try: stack.append(a+b)
+        except: stack.append(0)
+    def _sub(self,stack,arg):
+        b=stack.pop(); a=stack.pop()
+        try: stack.append(a-b)
+        except: stack.append(0)
+    def _mul(self,stack,arg):
+        b=stack.pop(); a=stack.pop()
+        try: stack.append(a*b)
+        except: stack.append(0)
+    def _div(self,stack,arg):
+        b=stack.pop(); a=stack.pop()
+        try: stack.append(a/b)
+        except: stack.append(0)
+    def _cmp_eq(self,stack,arg):
+        b=stack.pop(); a=stack.pop()
+        try: stack.append(a==b)
+        except: stack.append(0)
+    def _cmp_neq(self,stack,arg):
+        b=stack.pop(); a=stack.pop()
+        try: stack.append(a!=b)
+        except: stack.append(0)
+    def _cmp_lt(self,stack,arg):
+        b=stack.pop(); a=stack.pop()
+        try: stack.append(a<b)
+        except: stack.append(0)
+    def _cmp_gt(self,stack,arg):
+        b=stack.pop(); a=stack.pop()
+        try: stack.append(a>b)
+        except: stack.append(0)
+    def _cmp_le(self,stack,arg):
+        b=stack.pop(); a=stack.pop()
+        try: stack.append(a<=b)
+        except: stack.append(0)
+    def _cmp_ge(self,stack,arg):
+        b=stack.pop(); a=stack.pop()
+        try: stack.append(a>=b)
+        except: stack.append(0)
+    def _jump(self,stack,arg): return arg
+    def _jump_if_false(self,stack,arg):
+        if not stack.pop(): return arg
+    def _jump_if_false_or_pop(self,stack,arg):
+        if not stack[-1]: return arg
+        stack.pop()
+    def _jump_if_true_or_pop(self,stack,arg):
+        if stack[-1]: return arg
+        stack.pop()
+    def _guard_reset(self,stack,arg):
+        self._guards[arg]=0
+    def _loop(self,stack,arg):
+        # same per-execution runaway guard as Interpreter._s_wset: keyed
+        # by back-edge target, zeroed by GUARD_RESET at each loop entry
+        g=self._guards
+        c=g.get(arg,0)+1
+        g[arg]=c
+        if c<=10000: return arg
+    def _print(self,stack,arg): print(stack.pop())
+    def _input(self,stack,arg):
+        try: stack.append(input())
+        except: stack.append(0)
+    def _len(self,stack,arg):
+        v=stack.pop()
+        try: stack.append(len(v))
+        except: stack.append(0)
+    def _call(self,stack,arg):
+        prog=self.funcs.get(arg)
+        if prog is not None:
+            self.run(prog)
+    def _load_slot(self,stack,arg):
+        stack.append(self.slots[arg])
+    def _store_slot(self,stack,arg):
+        tp,i=arg
+        v=stack.pop()
+        try:
+            self.slots[i]=int(v) if tp=="INT" else float(v) if tp=="FLT" else v
+        except:
+            pass
+    def _load_i(self,stack,arg):
+        stack.append(self.slots_i[arg] if self.banks[arg]=="i"
+                     else self.slots[arg])
+    def _load_f(self,stack,arg):
+        stack.append(self.slots_f[arg] if self.banks[arg]=="f"
+                     else self.slots[arg])
+    def _store_i(self,stack,arg):
+        i,coerce=arg
+        v=stack.pop()
+        try:
+            if coerce: v=int(v)
+            self.slots_i[i]=v
+            self.banks[i]="i"
+        except OverflowError:
+            # past int64: demote to the generic bank, keep the exact value
+            self.banks[i]=None
+            self.slots[i]=v
+        except:
+            pass
+    def _store_f(self,stack,arg):
+        i,coerce=arg
+        v=stack.pop()
+        try:
+            self.slots_f[i]=float(v) if coerce else v
+            self.banks[i]="f"
+        except:
+            pass
+    def _add_i(self,stack,arg):
+        b=stack.pop(); stack.append(stack.pop()+b)
+    def _sub_i(self,stack,arg):
+        b=stack.pop(); stack.append(stack.pop()-b)
+    def _mul_i(self,stack,arg):
+        b=stack.pop(); stack.append(stack.pop()*b)
+    def _add_f(self,stack,arg):
+        b=stack.pop(); stack.append(stack.pop()+b)
+    def _sub_f(self,stack,arg):
+        b=stack.pop(); stack.append(stack.pop()-b)
+    def _mul_f(self,stack,arg):
+        b=stack.pop(); stack.append(stack.pop()*b)
+    def _div_f(self,stack,arg):
+        b=stack.pop(); a=stack.pop()
+        try: stack.append(a/b)
+        except: stack.append(0)
+    def _cmp_const_jif(self,stack,arg):
+        c,i,const,tgt=arg
+        try:
+            v=self.slots_i[i] if self.banks[i]=="i" else self.slots[i]
+            if not _CMPS[c](v,const): return tgt
+        except:
+            return tgt   # failed compare is falsy, same as CMP pushing 0
+    def _inc_var(self,stack,arg):
+        i,delta=arg
+        try:
+            if self.banks[i]=="i":
+                self.slots_i[i]+=delta
+            else:
+                self.slots[i]+=delta
+        except OverflowError:
+            self.banks[i]=None
+            self.slots[i]=self.slots_i[i]+delta
+        except:
+            pass
+    def _run_kernel(self,stack,arg):
+        fn,used,end=arg
+        get=self._slot_get
+        vals={i:get(i) for i in used}
+        if not all(type(v) is int and -2**63<=v<2**63 for v in vals.values()):
+            return None   # fall through to the interpreted loop
+        tmp=[0]*self.nslots
+        for i,v in vals.items(): tmp[i]=v
+        fn(tmp)
+        out={i:int(tmp[i]) for i in used}
+        if any(not -2**63<=v<2**63 for v in out.values()):
+            # a result does not fit the int64 banks: write nothing and
+            # rerun interpreted, whose stores forgive overflow per slot
+            return None
+        for i,v in out.items(): self._slot_set(i,v)
+        return end
+    def _setup_except(self,stack,arg):
+        self._blocks.append((arg,len(stack)))
+    def _pop_block(self,stack,arg):
+        self._blocks.pop()
+
+# =========================
+# INTERPRETER
+# =========================
+
+class Interpreter:
+    def __init__(self,nslots=0):
+        self.vars={}
+        self.slots=[0]*nslots
+        self.funcs=dict(FUNCS)
+        # statement dispatch indexed by AST tag: one list load, no hashing
+        st=[None]*N_TAGS
+        st[OP_VAR]=self._s_var; st[OP_VARSTORE]=self._s_varstore
+        st[OP_SET]=self._s_set
+        st[OP_IF]=self._s_if; st[OP_WSET]=self._s_wset
+        st[OP_BLOCK]=self._s_block; st[OP_TRY]=self._s_try
+        st[OP_FCE]=self._s_fce
+        self._stmt=st
+
+    def eval(self,root):
+        """Iterative postorder evaluation with an explicit work stack.
+
+        Deep left-leaning chains no longer recurse, so call overhead and
+        the recursion limit drop out. State 1 means the node's operands
+        (or, for and/or, just the left one) are on the value stack; a
+        falsy/truthy left operand short-circuits by simply not pushing
+        the right subtree. Failing ops yield 0, as recursive eval did.
+        Everything touched per node (stack methods, the fold table, the
+        variable store) is bound to a local up front.
+        """
+        try:
+            work=[(root,0)]
+            vals=[]
+            push=work.append
+            pop=vals.pop
+            append=vals.append
+            fold=_FOLD
+            slots=self.slots
+            getvar=self.vars.get
+            while work:
+                n,state=work.pop()
+                t=n[0]
+                if state:
+                    if t==OP_LEN:
+                        try: append(len(pop()))
+                        except: append(0)
+                    elif t==OP_AND:
+                        if vals[-1]:
+                            pop()
+                            push((n[2],0))
+                    elif t==OP_OR:
+                        if not vals[-1]:
+                            pop()
+                            push((n[2],0))
+                    else:
+                        b=pop(); a=pop()
+                        try: append(fold[t](a,b))
+                        except: append(0)
+                elif t<=OP_BOOL:
+                    append(n[1])
+                elif t==OP_VARSLOT:
+                    append(slots[n[1]])
+                elif t==OP_VARREF:
+                    append(getvar(n[1],0))
+                elif t==OP_INP:
+                    try: append(input())
+                    except: append(0)
+                elif t==OP_LEN or t==OP_AND or t==OP_OR:
+                    push((n,1)); push((n[1],0))
+                else:
+                    push((n,1)); push((n[2],0)); push((n[1],0))
+            return vals[-1] if vals else 0
+        except:
+            return 0
+
+    def run(self,stmts):
+        stmt=self._stmt
+        for s in stmts:
+            try:
+                stmt[s[0]](s)
+            except:
+                continue
+
+    def _s_var(self,s):
+        _,tp,n,v=s
+        val=self.eval(v)
+        self.vars[n]=int(val) if tp=="INT" else float(val) if tp=="FLT" else val
+    def _s_varstore(self,s):
+        _,tp,i,v=s
+        val=self.eval(v)
+        self.slots[i]=int(val) if tp=="INT" else float(val) if tp=="FLT" else val
+    def _s_set(self,s):
+        print(self.eval(s[1]))
+    def _s_if(self,s):
+        _,c,th,el=s
+        self.run([th]) if self.eval(c) else el and self.run([el])
+    def _s_wset(self,s):
+        _,c,b=s
+        guard=0
+        while self.eval(c):
+            self.run([b])
+            guard+=1
+            if guard>10000: break
+    def _s_block(self,s):
+        self.run(s[1])
+    def _s_try(self,s):
+        try:
+            self.run([s[1]])
+        except:
+            if s[2]: self.run([s[2]])
+    def _s_fce(self,s):
+        if s[1] in self.funcs:
+            self.run(self.funcs[s[1]])
+
+# =========================
+# PYTHON BACKEND
+# =========================
+
+# forgiving helpers bound into the exec namespace: a failing operand or
+# operation yields 0, matching Interpreter.eval and the VM handlers,
+# instead of aborting the whole emitted statement
+def _bin(op,a,b):
+    try: return _FOLD[op](a,b)
+    except: return 0
+
+def _len(v):
+    try: return len(v)
+    except: return 0
+
+def _inp():
+    try: return input()
+    except: return 0
+
+# and/or stay inline: they short-circuit and cannot fail themselves
+_PY_OP = {OP_AND:"and", OP_OR:"or"}
+
+class PyEmitter:
+    """Translates a resolved AST into Python source for compile().
+
+    CPython's own C dispatch loop then runs the program instead of any
+    of the Python-level interpreters. Slots become local names v0..vN,
+    wset keeps its runaway guard, binary ops go through the forgiving
+    _bin helper so a failing subexpression yields 0, and each statement
+    is additionally wrapped in try/except pass (covering the declared-
+    type cast, like STORE_VAR) so what remains broken is skipped.
+    """
+
+    def __init__(self):
+        self.lines=[]
+        self.depth=0
+        self.nloops=0
+
+    def emit(self,line):
+        self.lines.append("    "*self.depth+line)
+
+    def compile(self,stmts,nslots):
+        if nslots:
+            self.emit(" = ".join(f"v{i}" for i in range(nslots))+" = 0")
+        self.stmts(stmts)
+        return compile("\n".join(self.lines) or "pass","<set>","exec")
+
+    def run(self,stmts,nslots):
+        g={"__builtins__":{"print":print,"int":int,"float":float},
+           "_bin":_bin,"_len":_len,"_inp":_inp}
+        exec(self.compile(stmts,nslots),g)
+
+    def stmts(self,stmts):
+        emitted=False
+        for s in stmts:
+            if s:
+                self.stmt(s)
+                emitted=True
+        if not emitted:
+            self.emit("pass")
+
+    def block(self,s):
+        self.depth+=1
+        if s is None:
+            self.emit("pass")
+        elif s[0]==OP_BLOCK:
+            self.stmts(s[1])
+        else:
+            self.stmt(s)
+        self.depth-=1
+
+    def stmt(self,s):
+        t=s[0]
+        if t==OP_VARSTORE or t==OP_VAR:
+            tp=s[1]
+            tgt=f"v{s[2]}" if t==OP_VARSTORE else f"u_{s[2]}"
+            cast="int(%s)" if tp=="INT" else "float(%s)" if tp=="FLT" else "%s"
+            self.emit("try:")
+            self.depth+=1
+            self.emit(f"{tgt} = "+cast%self.expr(s[3]))
+            self.depth-=1
+            self.emit("except: pass")
+        elif t==OP_SET:
+            self.emit("try:")
+            self.depth+=1
+            self.emit(f"print({self.expr(s[1])})")
+            self.depth-=1
+            self.emit("except: pass")
+        elif t==OP_IF:
+            self.emit("try:")
+            self.depth+=1
+            self.emit(f"if ({self.expr(s[1])}):")
+            self.block(s[2])
+            if s[3]:
+                self.emit("else:")
+                self.block(s[3])
+            self.depth-=1
+            self.emit("except: pass")
+        elif t==OP_WSET:
+            g=self.nloops
+            self.nloops+=1
+            self.emit("try:")
+            self.depth+=1
+            self.emit(f"_g{g} = 0")
+            self.emit(f"while ({self.expr(s[1])}):")
+            self.depth+=1
+            if s[2] is None or (s[2][0]==OP_BLOCK and not s[2][1]):
+                self.emit("pass")
+            elif s[2][0]==OP_BLOCK:
+                self.stmts(s[2][1])
+            else:
+                self.stmt(s[2])
+            self.emit(f"_g{g} += 1")
+            self.emit(f"if _g{g}>10000: break")
+            self.depth-=1
+            self.depth-=1
+            self.emit("except: pass")
+        elif t==OP_BLOCK:
+            self.stmts(s[1])
+        elif t==OP_TRY:
+            self.emit("try:")
+            self.block(s[1])
+            self.emit("except:")
+            self.block(s[2])
+        elif t==OP_FCE:
+            body=FUNCS.get(s[1])
+            if body:
+                self.stmts(body)   # inline; bodies use name-based vars
+
+    def expr(self,n):
+        t=n[0]
+        if t<=OP_BOOL:
+            return repr(n[1])
+        if t==OP_VARSLOT:
+            return f"v{n[1]}"
+        if t==OP_VARREF:
+            return f"u_{n[1]}"
+        if t==OP_INP:
+            return "_inp()"
+        if t==OP_LEN:
+            return f"_len({self.expr(n[1])})"
+        if t<=OP_GE:
+            return f"_bin({t},{self.expr(n[1])},{self.expr(n[2])})"
+        return f"({self.expr(n[1])} {_PY_OP[t]} {self.expr(n[2])})"
+
+# =========================
+# RUNNER
+# =========================
+
+@functools.lru_cache(maxsize=128)
+def _prepare(src):
+    """Runs the whole front end once per distinct source string.
+
+    Returns (tree, nslots, program): the resolved AST for the fallback
+    tree-walker plus the compiled VM program. Nothing here
+    depends on run-time state (a fresh VM/Interpreter holds the slots),
+    so repeat run_code calls with identical source skip lexing, parsing,
+    resolving and compiling entirely.
+    """
+    tokens=Lexer(src).tokenize()
+    tree=Parser(tokens).parse()
+    r=Resolver()
+    tree,nslots=r.resolve(tree)
+    try:
+        program=Compiler(r.types).compile(tree)
+    except:
+        program=None   # NEVER crash; run_code falls back to the tree-walker
+    return tree,nslots,program
+
+def clear_cache():
+    _prepare.cache_clear()
+
+def run_code(code,backend="vm"):
+    print("SET v0.3.6 – Syntax Easy To-use\n")
+    tree,nslots,program=_prepare(code)
+    try:
+        if backend=="py":
+            PyEmitter().run(tree,nslots)
+        else:
+            VM(nslots).run(program)
+    except:
+        Interpreter(nslots).run(tree)   # NEVER crash
+
+if __name__=="__main__":
+    with open(sys.argv[1]) as f:
+        run_code(f.read())